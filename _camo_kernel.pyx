@@ -0,0 +1,20 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+from libc.stdint cimport uint8_t, uint32_t
+
+
+def threshold_camo(const uint32_t[::1] src, uint8_t[::1] out_idx, int t_hi=178, int t_lo=76):
+    # Classify RGB32 pixel words into 0 = black, 1 = grey, 2 = white areas
+    cdef Py_ssize_t i, n = src.shape[0]
+    cdef uint32_t p, gray
+    cdef uint32_t hi = t_hi, lo = t_lo
+
+    if out_idx.shape[0] < n:
+        raise ValueError("out_idx is smaller than src")
+
+    with nogil:
+        for i in range(n):
+            p = src[i]
+            # Fixed-point BT.601 luminance
+            gray = (((p >> 16) & 0xff) * 77 + ((p >> 8) & 0xff) * 150 + (p & 0xff) * 29) >> 8
+            # Branch-free select so the compiler can vectorize the loop
+            out_idx[i] = <uint8_t>((gray > hi) + (gray > lo))
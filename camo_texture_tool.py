@@ -1,15 +1,137 @@
 import os
 import json
+from array import array
+from functools import lru_cache
 import maya.cmds as cmds
 import maya.OpenMayaUI as omui
 from PySide2 import QtWidgets, QtCore, QtGui
 from shiboken2 import wrapInstance
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from _camo_kernel import threshold_camo
+except ImportError:
+    threshold_camo = None
+
 
 def maya_main_window():
     main_window = omui.MQtUtil.mainWindow()
     return wrapInstance(int(main_window), QtWidgets.QWidget)
 
+def _dumps(data):
+    # orjson skips the pure-Python indent formatting of json.dumps. Both paths
+    # use a 2-space indent so exports are identical on every machine.
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+def _scan_line(image, y):
+    # View one row of an RGB32 image as 32-bit pixel words
+    return memoryview(image.scanLine(y))[:4 * image.width()].cast("I")
+
+def _const_scan_line(image, y):
+    # Read-only variant that never detaches a shared image
+    return memoryview(image.constScanLine(y))[:4 * image.width()].cast("I")
+
+def build_index_map(image):
+    # Classify an RGB32 image into 0 = black, 1 = grey (30-70%), 2 = white (70%)
+    width, height = image.width(), image.height()
+    
+    if threshold_camo is not None:
+        index_map = bytearray(width * height)
+        threshold_camo(memoryview(image.constBits()).cast("I"), index_map)
+        if np is not None:
+            return np.frombuffer(index_map, np.uint8).reshape(height, width)
+        return index_map
+    
+    if np is not None:
+        pixels = np.frombuffer(image.constBits(), np.uint8).reshape(height, width, 4)
+        
+        # Fixed-point BT.601 luminance
+        gray = (pixels[..., 2].astype(np.uint16) * 77 +
+                pixels[..., 1].astype(np.uint16) * 150 +
+                pixels[..., 0].astype(np.uint16) * 29) >> 8
+        
+        return np.where(gray > 178, 2, np.where(gray > 76, 1, 0)).astype(np.uint8)
+    
+    # Without NumPy, walk scan lines instead of calling pixel() per pixel
+    index_map = bytearray(width * height)
+    for y in range(height):
+        line = _const_scan_line(image, y)
+        row = y * width
+        for x in range(width):
+            p = line[x]
+            gray = (((p >> 16) & 0xff) * 77 + ((p >> 8) & 0xff) * 150 + (p & 0xff) * 29) >> 8
+            index_map[row + x] = 2 if gray > 178 else (1 if gray > 76 else 0)
+    return index_map
+
+def paint_index_map(image, index_map, palette):
+    # Write palette[region] into every pixel of an RGB32 image
+    width, height = image.width(), image.height()
+    
+    if np is not None:
+        words = np.frombuffer(image.bits(), np.uint32).reshape(height, width)
+        words[:] = np.array(palette, dtype=np.uint32)[index_map]
+        return
+    
+    # Build each row's words with the palette bound locally, then write the row at once
+    lookup = palette.__getitem__
+    for y in range(height):
+        row = index_map[y * width:(y + 1) * width]
+        _scan_line(image, y)[:] = array("I", map(lookup, row))
+
+@lru_cache(maxsize=8)
+def _load_preview(file_path, mtime, size):
+    # mtime and size are part of the cache key so edited files are decoded again.
+    # The full-size source is only needed long enough to scale it down.
+    original_pixmap = QtGui.QPixmap(file_path)
+    if original_pixmap.isNull():
+        return None, None
+    
+    # Only the 200x200 preview is ever shown, so scale before thresholding.
+    # Smooth filtering is only safe here on the continuous-tone source; the
+    # thresholded result is never rescaled, so it keeps exactly three colors.
+    preview_image = original_pixmap.scaled(
+        200, 200,
+        QtCore.Qt.KeepAspectRatio,
+        QtCore.Qt.SmoothTransformation
+    ).toImage().convertToFormat(QtGui.QImage.Format_RGB32)
+    
+    # Classify every pixel once; color changes only re-map the regions
+    return preview_image, build_index_map(preview_image)
+
+class PreviewWorkerSignals(QtCore.QObject):
+    resultReady = QtCore.Signal(QtGui.QImage, int)
+
+class PreviewWorker(QtCore.QRunnable):
+    # Paints the preview off the main thread so Maya stays responsive
+    def __init__(self, image, index_map, palette, generation):
+        super(PreviewWorker, self).__init__()
+        self.image = image
+        self.index_map = index_map
+        self.palette = palette
+        self.generation = generation
+        self.signals = PreviewWorkerSignals()
+
+    def run(self):
+        # Always report back, with a null image on failure, so the widget's
+        # busy flag is cleared even if painting raises
+        image = QtGui.QImage()
+        try:
+            paint_index_map(self.image, self.index_map, self.palette)
+            image = self.image
+        finally:
+            self.signals.resultReady.emit(image, self.generation)
+
 class TexturePreviewWidget(QtWidgets.QLabel):
     def __init__(self, parent=None):
         super(TexturePreviewWidget, self).__init__(parent)
@@ -17,52 +139,86 @@ class TexturePreviewWidget(QtWidgets.QLabel):
         self.setAlignment(QtCore.Qt.AlignCenter)
         self.setText("No texture loaded")
         self.setStyleSheet("border: 1px solid gray")
-        self.original_pixmap = None
+        self.preview_image = None
+        self.index_map = None
         self.colors = {
             "white": QtGui.QColor(255, 255, 255),
             "grey": QtGui.QColor(128, 128, 128),
             "black": QtGui.QColor(0, 0, 0)
         }
+        
+        # Only one worker runs at a time; later requests wait for it to finish
+        self._worker = None
+        self._preview_pending = False
+        # Bumped on every texture change so results for an old texture are dropped
+        self._preview_generation = 0
+        
+        # Coalesce bursts of color changes into a single repaint
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(50)
+        self._refresh_timer.timeout.connect(self._do_update_preview)
 
     def load_texture(self, file_path):
+        self._preview_generation += 1
+        self.preview_image = None
+        self.index_map = None
+        
         if not file_path or not os.path.exists(file_path):
             self.setText("No texture loaded")
-            self.original_pixmap = None
             return
 
-        self.original_pixmap = QtGui.QPixmap(file_path)
+        # Reopening the editor or reloading the same file skips the decode
+        stat = os.stat(file_path)
+        self.preview_image, self.index_map = _load_preview(
+            file_path, stat.st_mtime, stat.st_size)
+        if self.preview_image is None:
+            self.setText("No texture loaded")
+            return
+        
         self.update_preview()
 
     def update_preview(self):
-        if not self.original_pixmap:
+        self._refresh_timer.start()
+
+    def _do_update_preview(self):
+        if self.index_map is None:
+            return
+        
+        if self._worker is not None:
+            self._preview_pending = True
             return
             
-        # Create working copy
-        image = self.original_pixmap.toImage()
-        
-        # Process each pixel
-        for x in range(image.width()):
-            for y in range(image.height()):
-                pixel = image.pixel(x, y)
-                gray = QtGui.qGray(pixel)
-                
-                if gray > 178:  # White areas (70%)
-                    image.setPixel(x, y, self.colors["white"].rgb())
-                elif gray > 76:  # Grey areas (30-70%)
-                    image.setPixel(x, y, self.colors["grey"].rgb())
-                else:  # Black areas
-                    image.setPixel(x, y, self.colors["black"].rgb())
-        
-        # Convert back to pixmap and scale
-        pixmap = QtGui.QPixmap.fromImage(image)
-        scaled_pixmap = pixmap.scaled(
-            200, 200,
-            QtCore.Qt.KeepAspectRatio,
-            QtCore.Qt.SmoothTransformation
-        )
-        self.setPixmap(scaled_pixmap)
+        # QColor.rgb() is 0xAARRGGBB, which matches a Format_RGB32 pixel word
+        palette = [
+            self.colors["black"].rgb(),
+            self.colors["grey"].rgb(),
+            self.colors["white"].rgb()
+        ]
+        
+        # Every pixel gets overwritten, so paint into a fresh image instead of a copy
+        image = QtGui.QImage(self.preview_image.size(), QtGui.QImage.Format_RGB32)
+        self._worker = PreviewWorker(
+            image, self.index_map, palette, self._preview_generation)
+        self._worker.signals.resultReady.connect(
+            self._on_preview_ready, QtCore.Qt.QueuedConnection)
+        QtCore.QThreadPool.globalInstance().start(self._worker)
+
+    def _on_preview_ready(self, image, generation):
+        self._worker = None
+        
+        # Skip results painted for a texture that was replaced or cleared meanwhile
+        if (not image.isNull() and generation == self._preview_generation
+                and self.index_map is not None):
+            self.setPixmap(QtGui.QPixmap.fromImage(image))
+        
+        if self._preview_pending:
+            self._preview_pending = False
+            self._do_update_preview()
 
     def update_color(self, area, color):
+        if self.colors.get(area) == color:
+            return
         self.colors[area] = color
         self.update_preview()
 
@@ -166,8 +322,8 @@ class CamoTextureEditor(QtWidgets.QDialog):
             if not file_path.endswith('.json'):
                 file_path += '.json'
             
-            with open(file_path, 'w') as f:
-                json.dump(colors_data, f, indent=4)
+            with open(file_path, 'wb') as f:
+                f.write(_dumps(colors_data))
                 
             QtWidgets.QMessageBox.information(
                 self,
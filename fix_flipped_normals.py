@@ -1,5 +1,18 @@
 import maya.cmds as cmds
-import maya.OpenMaya as om
+import maya.api.OpenMaya as om
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Last classification per mesh node:
+#     MObjectHandle hash -> (MObjectHandle, fingerprint, flipped face ids)
+# Validity rests on the fingerprint alone; no Maya callbacks are registered, so
+# re-running this script cannot leave any behind.
+_flip_cache = {}
+# Points and faces sampled into the fingerprint, spread evenly over the mesh
+_FINGERPRINT_SAMPLES = 16
 
 def fix_flipped_normals():
     # Clear previous log
@@ -24,52 +37,122 @@ def fix_flipped_normals():
         if not cmds.objectType(mesh, isType="mesh"):
             continue
             
-        # Get the mesh's MFnMesh
+        # Get the mesh's DAG path
         selection_list = om.MSelectionList()
         selection_list.add(mesh)
-        dag_path = om.MDagPath()
-        selection_list.getDagPath(0, dag_path)
-        mesh_fn = om.MFnMesh(dag_path)
+        dag_path = selection_list.getDagPath(0)
         
-        # Get face normals
-        normal_count = mesh_fn.numNormals()
-        face_count = mesh_fn.numPolygons()
-        
-        flipped_faces = []
-        
-        # Check each face's normal direction
-        for face_id in range(face_count):
-            normal = om.MVector()
-            mesh_fn.getPolygonNormal(face_id, normal)
-            
-            # Get face center position
-            center = om.MVector()  # Changed from MPoint to MVector
-            vertices = om.MPointArray()
-            mesh_fn.getPoints(vertices)
-            
-            vertex_list = om.MIntArray()
-            mesh_fn.getPolygonVertices(face_id, vertex_list)
-            
-            # Calculate geometric center using MVector
-            for i in range(vertex_list.length()):
-                vertex_point = vertices[vertex_list[i]]
-                center += om.MVector(vertex_point.x, vertex_point.y, vertex_point.z)
-            center = center / vertex_list.length()
-            
-            # Check if normal is pointing inward
-            if normal.length() > 0:
-                normalized_normal = normal.normal()
-                if normalized_normal * center < 0:  # Simplified since center is already MVector
-                    flipped_faces.append(face_id)
+        flipped_faces = get_flipped_faces(dag_path)
         
         # Fix flipped faces
         if flipped_faces:
-            face_names = [f"{mesh}.f[{face}]" for face in flipped_faces]
+            face_names = face_ranges(mesh, flipped_faces)
             cmds.polyNormal(face_names, normalMode=0, userNormalMode=0, ch=1)
+            # The fix reverses these faces, so the cached result no longer applies
+            forget_flipped_faces(dag_path)
             log_message(f"Fixed {len(flipped_faces)} flipped normals in {obj}")
         else:
             log_message(f"No flipped normals found in {obj}")
 
+def get_flipped_faces(dag_path):
+    # Reuse the last classification while the mesh node is unchanged.
+    # Entries are keyed by node identity, not name: a new node at the same path
+    # (new scene, re-created primitive) must never pick up another mesh's result.
+    node = dag_path.node()
+    handle = om.MObjectHandle(node)
+    key = handle.hashCode()
+    fingerprint = _mesh_fingerprint(dag_path)
+    
+    cached = _flip_cache.get(key)
+    if (cached is not None and cached[0].isValid() and cached[0].object() == node
+            and cached[1] == fingerprint):
+        return cached[2]
+    
+    flipped_faces = find_flipped_faces(dag_path)
+    
+    # Drop entries for nodes that have since been deleted
+    for stale_key in [k for k, entry in _flip_cache.items() if not entry[0].isValid()]:
+        del _flip_cache[stale_key]
+    _flip_cache[key] = (handle, fingerprint, flipped_faces)
+    return flipped_faces
+
+def forget_flipped_faces(dag_path):
+    _flip_cache.pop(om.MObjectHandle(dag_path.node()).hashCode(), None)
+
+def _mesh_fingerprint(dag_path):
+    # Cheap summary of topology, shape and winding. Deformers and time changes
+    # move points (and the bounding box) without changing any counts, and a
+    # reversed face changes its vertex order.
+    mesh_fn = om.MFnMesh(dag_path)
+    face_count = mesh_fn.numPolygons
+    vertex_count = mesh_fn.numVertices
+    bbox = mesh_fn.boundingBox
+    
+    point_ids = range(0, vertex_count, max(1, vertex_count // _FINGERPRINT_SAMPLES))
+    face_ids = range(0, face_count, max(1, face_count // _FINGERPRINT_SAMPLES))
+    return (
+        face_count, vertex_count, mesh_fn.numFaceVertices,
+        tuple(bbox.min), tuple(bbox.max),
+        tuple(tuple(mesh_fn.getPoint(i, om.MSpace.kObject)) for i in point_ids),
+        tuple(tuple(mesh_fn.getPolygonVertices(i)) for i in face_ids)
+    )
+
+def find_flipped_faces(dag_path):
+    # Return the ids of faces whose normal points toward the object origin
+    if np is None:
+        # Without NumPy, let Maya's polygon iterator compute centers and normals
+        flipped_faces = []
+        poly_it = om.MItMeshPolygon(dag_path)
+        while not poly_it.isDone():
+            center = poly_it.center(om.MSpace.kObject)
+            normal = poly_it.getNormal(om.MSpace.kObject)
+            if normal * om.MVector(center) < 0:
+                flipped_faces.append(poly_it.index())
+            poly_it.next()
+        return flipped_faces
+    
+    mesh_fn = om.MFnMesh(dag_path)
+    
+    face_count = mesh_fn.numPolygons
+    if not face_count:
+        return []
+    
+    # Fetch all vertex positions once (MPoint is x, y, z, w)
+    points = np.array(mesh_fn.getPoints(om.MSpace.kObject))[:, :3]
+    
+    # Fetch per-face vertex counts and the flat face-vertex index list
+    vertex_counts, vertex_list = mesh_fn.getVertices()
+    counts = np.array(vertex_counts)
+    connects = np.array(vertex_list)
+    
+    # Geometric center of every face
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    centers = np.add.reduceat(points[connects], offsets, axis=0) / counts[:, None]
+    
+    # Face normals
+    normals = np.array([mesh_fn.getPolygonNormal(face_id, om.MSpace.kObject)
+                        for face_id in range(face_count)])
+    
+    # Normal pointing inward (zero-length normals never pass this test)
+    return np.flatnonzero((normals * centers).sum(axis=1) < 0).tolist()
+
+def face_ranges(mesh, face_ids):
+    # Compress face ids into component ranges, e.g. mesh.f[0:17], mesh.f[42]
+    face_names = []
+    face_ids = sorted(face_ids)
+    start = end = face_ids[0]
+    for face in face_ids[1:] + [None]:
+        if face is not None and face == end + 1:
+            end = face
+            continue
+        if end > start:
+            face_names.append(f"{mesh}.f[{start}:{end}]")
+        else:
+            face_names.append(f"{mesh}.f[{start}]")
+        if face is not None:
+            start = end = face
+    return face_names
+
 def log_message(message):
     # Add message to log field and print to console
     cmds.scrollField('normalFixerLog', edit=True, insertText=message + '\n')
@@ -0,0 +1,21 @@
+# Builds the optional compiled kernel used by camo_texture_tool.py:
+#     python setup.py build_ext --inplace
+# The tool falls back to Numba/NumPy/pure Python when it isn't built.
+import sys
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+# Keep to the platform's baseline instruction set: the module is copied to other
+# artists' machines, and an instruction their CPU lacks crashes Maya on the first
+# call instead of falling back. SSE2 is already the x86-64 baseline.
+if sys.platform == "win32":
+    compile_args = ["/O2"]
+else:
+    compile_args = ["-O3"]
+
+setup(
+    name="camo_kernel",
+    ext_modules=cythonize([
+        Extension("_camo_kernel", ["_camo_kernel.pyx"], extra_compile_args=compile_args)
+    ]),
+)